@@ -8,7 +8,7 @@ from sqlalchemy import select , update # This lets Python talk to the database.
 
 from app.config import get_db_session # opens a safe connectio to db, do work and close it properly
 
-from app.db.postgres.models import Chat, ChatStatus # chat -> table , ChatStatus -> the bitmask flag
+from app.db.postgres.models import Chat # chat -> table
 
 def create_chat(user_id: int, title: Optional[str] = None, mode: Optional[str] = None) -> dict:
     """ Create a new chat """
@@ -36,25 +36,27 @@ def create_chat(user_id: int, title: Optional[str] = None, mode: Optional[str] =
 def list_chats(user_id: int) -> List[dict]: # Takes user id and returns a list of chats
     """ Get all non - deleted chats for a user """
     with get_db_session() as session:
-        stmt = select(Chat).where(
-            Chat.user_id == user_id,
-            Chat.status.op("&")(ChatStatus.DELETED) == 0 , # 0 -> not deleted
-            ).order_by(Chat.updated_at.desc())
-
-        rows = session.execute(stmt).scalars().all() # stmt -> sends  query to PortgreSQL, scalars -> extract chat objects, all -> get all results as a list 
-
-        return [
-            {
-            "id": str(r.id),
-             "user_id": r.user_id,
-             "title": r.title,
-             "mode": r.mode,
-             "state": r.state,
-             "created_at": r.created_at,
-             "updated_at": r.updated_at,    
-            }
-            for r in rows
-        ] # JSON friendly -> For every chat object r , make a dictionary
+        stmt = (
+            select(
+                Chat.id,
+                Chat.user_id,
+                Chat.title,
+                Chat.mode,
+                Chat.state,
+                Chat.created_at,
+                Chat.updated_at,
+            ) # Only the columns we return -> no Chat objects / change tracking
+            .where(
+                Chat.user_id == user_id,
+                ~Chat.is_deleted, # NOT deleted -> matches the partial index on (user_id, updated_at)
+            )
+            .order_by(Chat.updated_at.desc())
+            .execution_options(yield_per=100) # stream rows in batches instead of buffering them all
+        )
+
+        rows = session.execute(stmt).mappings() # mappings -> each row is already dict-like (column name -> value)
+
+        return [dict(row, id=str(row["id"])) for row in rows] # JSON friendly -> only the UUID needs converting
 
 def get_chat(chat_id: UUID, user_id: int) -> Optional[dict]: # Opens one specific chat
     """Getting a specific chat"""
@@ -62,7 +64,7 @@ def get_chat(chat_id: UUID, user_id: int) -> Optional[dict]: # Opens one specifi
         stmt =  select(Chat).where(
             Chat.id == chat_id,
             Chat.user_id == user_id,
-            Chat.status.op("&")(ChatStatus.DELETED) == 0,
+            ~Chat.is_deleted,
         ) # User can ONLY open their own chats
         chat = session.execute(stmt).scalars().first()
 
@@ -135,7 +137,7 @@ def delete_chat(chat_id: UUID, user_id: int) -> dict:
             return {"chat_id": str(chat_id), "deleted":False}
 
         # set deleted chat
-        update_stmt = (update(Chat).where(Chat.id == chat_id, Chat.user_id == user_id).values(status=Chat.status.op("|")(ChatStatus.DELETED))
+        update_stmt = (update(Chat).where(Chat.id == chat_id, Chat.user_id == user_id).values(is_deleted=True)
         )
 
         session.execute(update_stmt)
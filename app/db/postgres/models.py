@@ -2,28 +2,31 @@
 # This is schema.
 
 # Importing Toolkit
-from sqlalchemy import(
-    Column,
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import uuid
+
+from sqlalchemy import (
     Integer,
     String,
     DateTime,
     Text,
     Boolean,
     ForeignKey, # Link to another table
+    Index,      # Speeds up the queries we run most
     JSON,
     func,       # current thing
     text        # Raw SQL text
 )
 
 from sqlalchemy.dialects.postgresql import UUID     #PostgreSQL has a special UUID type (a v long , random ID)
-from sqlalchemy.orm import declarative_base 
+from sqlalchemy.dialects.postgresql import JSONB, ARRAY   # JSONB -> binary JSON (no re-parsing, indexable) , ARRAY -> native list column
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+
 
-Base = declarative_base()   # Think of it as a base class
+class Base(DeclarativeBase):   # Think of it as a base class
+    pass
 
-class ChatStatus: # Status Flags
-    DELETED = 1
-    ARCHIEVED = 2
-    FLAGGED = 4
 
 # =================================
 # TABLE # 1: USERS
@@ -31,79 +34,96 @@ class ChatStatus: # Status Flags
 
 class User(Base):
     __tablename__ = "users" # This creates a table named Users
-    id = Column(Integer,primary_key=True) #Each user gets a unique id
-    username = Column(String(255),unique=True, nullable=False) # Must exist, must be unique and max 255 characters
-    email = Column(String(255),unique=True, nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True) #Each user gets a unique id
+    username: Mapped[str] = mapped_column(String(255), unique=True, nullable=False) # Must exist, must be unique and max 255 characters
+    email: Mapped[str] = mapped_column(String(255), unique=True, nullable=False)
 
 
     # Optional info
-    first_name = Column(String(100))
-    last_name = Column(String(100))
+    first_name: Mapped[Optional[str]] = mapped_column(String(100))
+    last_name: Mapped[Optional[str]] = mapped_column(String(100))
 
     # Firebase Integartion(-----)
-    firebase_uid = Column(String(255), unique=True) # Links your db to Firebase user
+    firebase_uid: Mapped[Optional[str]] = mapped_column(String(255), unique=True) # Links your db to Firebase user
 
-    # Meta 
-    meta = Column(JSON, default=dict)
+    # Meta
+    meta: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSON, default=dict)
 
     # Timestamps
-    created_at = Column(DateTime(timezone=True),server_default=func.now()) # When user was created
-    updated_at = Column(DateTime(timezone=True),server_default=func.now()) # When user was updtaed
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now()) # When user was created
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now()) # When user was updtaed
+
+    is_active: Mapped[bool] = mapped_column(Boolean, default=True)
 
-    is_active = Column(Boolean, default=True)
-    
 # =====================================
 # TABLE # 2: CHATS
 # =====================================
 
 class Chat(Base):
     __tablename__= "chats"
+    __table_args__ = (
+        # list_chats -> WHERE user_id = ? AND NOT is_deleted ORDER BY updated_at DESC
+        # (btree is read backwards for DESC, so no separate descending index needed)
+        Index(
+            "ix_chats_active_by_user",
+            "user_id",
+            "updated_at",
+            postgresql_where=text("NOT is_deleted"),
+        ),
+    )
 
-    id = Column(
+    id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
         server_default=text("gen_random_uuid()")
     ) # Database automatically creates a random ID. No two chats ever collide
 
-    user_id = Column(Integer , ForeignKey("users.id"), nullable=False) # Means this chat belongs to one user
-    title = Column(String(255)) # chat name
-    state = Column(String(50),default="IDLE") # what bot is doing (Idle , Generating , Waiting)
-    mode = Column(String(50))   # advertisement or general
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False) # Means this chat belongs to one user
+    title: Mapped[Optional[str]] = mapped_column(String(255)) # chat name
+    state: Mapped[Optional[str]] = mapped_column(String(50), default="IDLE") # what bot is doing (Idle , Generating , Waiting)
+    mode: Mapped[Optional[str]] = mapped_column(String(50))   # advertisement or general
 
     # Timestamps
-    created_at = Column(DateTime(timezone=True),server_default=func.now()) # When chat was created
-    updated_at = Column(DateTime(timezone=True),server_default=func.now()) # When chat was updtaed
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now()) # When chat was created
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now()) # When chat was updtaed
 
-    status = Column(Integer, default=0) # Chat status ( 0 -> normal, 1 -> deleted , 2 -> archived , 5 deleted + flagged)
+    # Chat status flags -> one boolean each (a bitmask test like status & 1 can't use an index)
+    is_deleted: Mapped[bool] = mapped_column(Boolean, default=False, server_default=text("false"), nullable=False)
+    is_archived: Mapped[bool] = mapped_column(Boolean, default=False, server_default=text("false"), nullable=False)
+    is_flagged: Mapped[bool] = mapped_column(Boolean, default=False, server_default=text("false"), nullable=False)
 
 # =====================================
 # TABLE # 3: MESSAGES
 # =====================================
 class Message(Base):
     __tablename__ = "messages"
+    __table_args__ = (
+        # GIN -> fast key / containment lookups like input @> '{"type": "image"}'
+        Index("ix_messages_input_gin", "input", postgresql_using="gin"),
+    )
 
-    id = Column(
+    id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
         server_default=text("gen_random_uuid()")
     )
 
     # Chat connection
-    chat_id = Column(
+    chat_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("chats.id",ondelete="CASCADE"),
         nullable=False
-    )   # onedelete="CASCADE" -> if a chat is deletd--delete all its messages automatically
-    
-    role = Column(String(50)) # user or assistant ??
-    content = Column(Text)  # Actual text message
+    )   # ondelete="CASCADE" -> if a chat is deletd--delete all its messages automatically
+
+    role: Mapped[Optional[str]] = mapped_column(String(50)) # user or assistant ??
+    content: Mapped[Optional[str]] = mapped_column(Text)  # Actual text message
 
-    input = Column(JSON)
-    output = Column(JSON)   # stores user inputs , model outputs , tokens , metadata, scores etc
-    created_at = Column(DateTime(timezone=True), server_default=func.now())  
-    updated_at = Column(DateTime(timezone=True), server_default=func.now())  
+    input: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB)
+    output: Mapped[Optional[Dict[str, Any]]] = mapped_column(JSONB)   # stores user inputs , model outputs , tokens , metadata, scores etc
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
 
-    status = Column(String(50))
+    status: Mapped[Optional[str]] = mapped_column(String(50))
 
 # =====================================
 # TABLE # 3: POSTS
@@ -112,35 +132,35 @@ class Message(Base):
 class Post(Base):
     __tablename__ ="posts"
 
-    id = Column(
+    id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         primary_key=True,
         server_default=text("gen_random_uuid()")
     )
 
-    user_id =Column(Integer , ForeignKey("users.id") , nullable=False)
-    chat_id = Column(UUID(as_uuid=True), ForeignKey("chats.id"), nullable=True)
-    mode = Column(String(50))
+    user_id: Mapped[int] = mapped_column(Integer, ForeignKey("users.id"), nullable=False)
+    chat_id: Mapped[Optional[uuid.UUID]] = mapped_column(UUID(as_uuid=True), ForeignKey("chats.id"), nullable=True)
+    mode: Mapped[Optional[str]] = mapped_column(String(50))
 
     # Product Advertisement Info
-    product_name = Column(String(255))
-    description = Column(Text)
+    product_name: Mapped[Optional[str]] = mapped_column(String(255))
+    description: Mapped[Optional[str]] = mapped_column(Text)
 
     # Generated content
-    image_url = Column(Text)
-    image_filename = Column(String(255))
-    caption = Column(Text)
-    hashtags = Column(JSON , default=[])
+    image_url: Mapped[Optional[str]] = mapped_column(Text)
+    image_filename: Mapped[Optional[str]] = mapped_column(String(255))
+    caption: Mapped[Optional[str]] = mapped_column(Text)
+    hashtags: Mapped[Optional[List[str]]] = mapped_column(ARRAY(String(255)), default=list) # flat list -> native text[] instead of JSON
 
     # Publishing Info
-    platform = Column(String(50)) # insta , fb , both..
-    status = Column(String(50), default="draft") # draft, published , failed
+    platform: Mapped[Optional[str]] = mapped_column(String(50)) # insta , fb , both..
+    status: Mapped[Optional[str]] = mapped_column(String(50), default="draft") # draft, published , failed
 
     # Social Media Post IDs
 
-    post_id_instagram = Column(String(255)) # Social media Ids returned by FB/Inst API
-    post_id_facebook = Column(String(255))
+    post_id_instagram: Mapped[Optional[str]] = mapped_column(String(255)) # Social media Ids returned by FB/Inst API
+    post_id_facebook: Mapped[Optional[str]] = mapped_column(String(255))
 
     # Timestamps
-    created_at = Column(DateTime(timezone=True),server_default=func.now()) # When post was created
-    published_at = Column(DateTime(timezone=True)) # When it was live
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now()) # When post was created
+    published_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True)) # When it was live
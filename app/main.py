@@ -1,27 +1,83 @@
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
-from config import get_settings
-import os
 
+# Load .env exactly once, before app.config builds the settings singleton
 load_dotenv()
 
-settings = get_settings()
+import asyncio
+import logging
+import sys
+from typing import Optional
+
+# One logging setup for the whole app (service modules only create their loggers)
+logging.basicConfig(level=logging.INFO)
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from app.config import get_settings
 
-app = FastAPI(title= "Social Media Bot" , version="1.0.0")
+settings = get_settings()
 
-# Initilizing OpenAI API key path
-app = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+app = FastAPI(
+    title= "Social Media Bot" ,
+    version="1.0.0",
+    default_response_class=ORJSONResponse,  # orjson instead of stdlib json for every route
+)
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=list(settings.cors_origins),  # set CORS_ORIGINS in production
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
+# Background warm-up task (kept so shutdown can cancel it and it isn't garbage collected mid-run)
+_warm_up_task: Optional[asyncio.Task] = None
+
+
+@app.on_event("startup")
+async def warm_up_clients():
+    """Start logging in to the configured social platforms before the first request needs them"""
+    global _warm_up_task
+    if settings.warm_up_platforms:
+        from app.services.social_media import get_social_media_service
+        # Not awaited -> the app serves requests right away instead of waiting on (or hanging in) the logins
+        _warm_up_task = asyncio.create_task(get_social_media_service().warm_up())
+
+
+@app.on_event("shutdown")
+async def close_clients():
+    """Close pooled HTTP clients of the services this worker actually loaded"""
+    if _warm_up_task is not None and not _warm_up_task.done():
+        _warm_up_task.cancel()
+
+    llm_module = sys.modules.get("app.services.llm_services")
+    if llm_module is not None:
+        await llm_module.llm_service.close()
+
+    social_module = sys.modules.get("app.services.social_media")
+    if social_module is not None and social_module.get_social_media_service.cache_info().currsize:
+        social_module.get_social_media_service().close()  # only if it was ever created
+
+
 @app.get("/")
 async def root():
     return {"message": "Social Media Bot is running",
-            "environment": settings.app_env}
\ No newline at end of file
+            "environment": settings.app_env}
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    # "auto" picks uvloop + httptools when installed (see requirements.txt)
+    # and falls back to asyncio / h11 on platforms without them (e.g. Windows)
+    uvicorn.run(
+        "app.main:app",
+        host=settings.host,
+        port=settings.port,
+        workers=settings.workers,
+        loop="auto",
+        http="auto",
+        limit_concurrency=settings.limit_concurrency,
+    )
@@ -1,25 +1,17 @@
-from pydantic import BaseModel, Field, validator
-from typing import Optional, Literal
+from pydantic import BaseModel, Field, StringConstraints
+from typing import Annotated, Optional, Literal
 
 
 # ============ ADVERTISEMENT MODE MODELS ============
 
 class GenerateProductImageRequest(BaseModel):
     """Request to generate product image from description"""
-    product_description: str = Field(
-        ...,
-        min_length=10,
-        max_length=1000,
-        description="Detailed description of the product"
-    )
+    product_description: Annotated[
+        str,
+        StringConstraints(strip_whitespace=True, min_length=10, max_length=1000)
+    ] = Field(..., description="Detailed description of the product")
     style: Literal["professional", "casual", "creative", "minimalist"] = "professional"
 
-    @validator('product_description')
-    def validate_description(cls, v):
-        if not v.strip():
-            raise ValueError('Product description cannot be empty')
-        return v.strip()
-
 
 class GenerateCaptionRequest(BaseModel):
     """Request to generate post caption"""
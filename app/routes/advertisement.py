@@ -1,15 +1,32 @@
-from fastapi import APIRouter, HTTPException
+from functools import lru_cache
+from typing import Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
-from app.services.llm_service import LLMService
+from app.utils.helpers import json_body, json_body_openapi
 
 router = APIRouter(prefix="/advertisement", tags=["Advertisement"])
-llm_service = LLMService()
+
+
+@lru_cache()
+def _llm():
+    """Import the LLM service (OpenAI client) on first use, not at app startup"""
+    from app.services.llm_services import llm_service
+    return llm_service
+
+
+# One suffix per ProductRequest.style value, built once instead of per request
+_STYLE_SUFFIX = {
+    "professional": ", professional photography style",
+    "casual": ", casual photography style",
+    "creative": ", creative photography style",
+    "minimalist": ", minimalist photography style",
+}
 
 
 class ProductRequest(BaseModel):
     product_description: str
-    style: str = "professional"  # professional, casual, creative
-    platform: str = "instagram"  # instagram, facebook, both
+    style: Literal["professional", "casual", "creative", "minimalist"] = "professional"
+    platform: Literal["instagram", "facebook", "both"] = "instagram"
 
 
 class CaptionRequest(BaseModel):
@@ -25,12 +42,15 @@ class PostRequest(BaseModel):
     platform: str  # instagram, facebook, both
 
 
-@router.post("/generate-image")
-async def generate_product_image(request: ProductRequest):
+@router.post("/generate-image", openapi_extra=json_body_openapi(ProductRequest))
+async def generate_product_image(
+        request: ProductRequest = Depends(json_body(ProductRequest)),
+        llm_service=Depends(_llm)
+):
     """Step 1: Generate product image from description"""
     try:
         # Enhance prompt based on style
-        enhanced_prompt = f"{request.product_description}, {request.style} photography style"
+        enhanced_prompt = request.product_description + _STYLE_SUFFIX[request.style]
 
         image_url = await llm_service.generate_image(enhanced_prompt)
 
@@ -44,8 +64,11 @@ async def generate_product_image(request: ProductRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/generate-caption")
-async def generate_caption(request: CaptionRequest):
+@router.post("/generate-caption", openapi_extra=json_body_openapi(CaptionRequest))
+async def generate_caption(
+        request: CaptionRequest = Depends(json_body(CaptionRequest)),
+        llm_service=Depends(_llm)
+):
     """Step 2: Generate post caption"""
     try:
         caption = await llm_service.generate_caption(
@@ -64,8 +87,8 @@ async def generate_caption(request: CaptionRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/preview")
-async def preview_post(request: PostRequest):
+@router.post("/preview", openapi_extra=json_body_openapi(PostRequest))
+async def preview_post(request: PostRequest = Depends(json_body(PostRequest))):
     """Step 3: Preview before posting"""
     return {
         "success": True,
@@ -78,8 +101,8 @@ async def preview_post(request: PostRequest):
     }
 
 
-@router.post("/post")
-async def post_to_social_media(request: PostRequest):
+@router.post("/post", openapi_extra=json_body_openapi(PostRequest))
+async def post_to_social_media(request: PostRequest = Depends(json_body(PostRequest))):
     """Step 4: Actually post to social media"""
     # This will be implemented in Phase 4
     return {
@@ -1,22 +1,42 @@
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-from app.models.requests import GenerateCaptionRequest, PublishPostRequest
-from app.models.responses import CaptionGenerationResponse, PostPublishResponse
-from app.services.llm_service import LLMService
-from app.services.image_service import ImageService
-from app.services.social_media_service import SocialMediaService
+from functools import lru_cache
+import logging
+import os
+from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
+from app.models.request import GenerateCaptionRequest, PublishPostRequest
+from app.models.response import CaptionGenerationResponse, PostPublishResponse
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/general", tags=["General Post Mode"])
 
-llm_service = LLMService()
-image_service = ImageService()
-social_service = SocialMediaService()
+
+# Services are imported on first use so a worker only loads the SDKs it needs
+@lru_cache()
+def _llm():
+    from app.services.llm_services import llm_service
+    return llm_service
+
+
+@lru_cache()
+def _images():
+    from app.services.image_service import image_service
+    return image_service
+
+
+def _upload_size(file: UploadFile) -> int:
+    """Size of the spooled upload in bytes (seek to the end and back, nothing is read)"""
+    file.file.seek(0, os.SEEK_END)
+    size = file.file.tell()
+    file.file.seek(0)
+    return size
 
 
 @router.post("/upload-image")
 async def upload_image(
         file: UploadFile = File(...),
         description: str = Form(None),
-        should_analyze: bool = Form(True)
+        should_analyze: bool = Form(True),
+        image_service=Depends(_images)
 ):
     """
     STEP 1 (General Flow): Upload existing image
@@ -24,41 +44,48 @@ async def upload_image(
     Flow:
     User uploads image → Validate → Save → Optionally analyze with GPT-4 Vision
     """
-    # Read file content
-    content = await file.read()
+    # Cheap check first: size comes from the spooled file's length, nothing is read
+    size = _upload_size(file)
+    if size > image_service.max_image_size:
+        raise HTTPException(status_code=413, detail="Image too large")
 
-    # Validate image
-    validation = await image_service.validate_image(content)
+    # Header-only probe (format from settings.allowed_image_formats, dimensions) before anything is saved
+    validation = await image_service.avalidate_upload(file.file, size)  # off the event loop
     if not validation.get("valid"):
-        raise HTTPException(status_code=400, detail=validation.get("error"))
+        raise HTTPException(status_code=400, detail="; ".join(validation.get("issues", [])))
 
-    # Save image
-    save_result = await image_service.save_image(content, file.filename)
-    if not save_result.get("success"):
-        raise HTTPException(status_code=500, detail=save_result.get("error"))
+    # Save image (PIL reads straight from the spooled upload file, no bytes copy)
+    try:
+        saved_path = await image_service.asave_uploaded_image(file.file, file.filename)  # off the event loop
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
 
     response = {
         "success": True,
-        "image_url": save_result["url"],
-        "filename": save_result["filename"],
-        "size": validation["size"],
-        "dimensions": validation["dimensions"]
+        "image_url": f"/static/images/{saved_path.name}",
+        "filename": saved_path.name,
+        "size": size,
+        "dimensions": f"{validation['width']}x{validation['height']}"
     }
 
     # Optional: Analyze image for caption generation help
     if should_analyze:
-        analysis = await llm_service.analyze_and_describe_image(
-            image_url=save_result["url"],
+        # Resolved here, not via Depends -> uploads without analysis never load the OpenAI SDK
+        # Local file, not image_url: /static isn't reachable from OpenAI. Failure only skips the analysis
+        analysis = await _llm().analyze_and_describe_image(
+            image_path=saved_path,
             purpose="caption_help"
         )
         if analysis.get("success"):
             response["image_analysis"] = analysis["analysis"]
+        else:
+            logger.warning("Image analysis skipped: %s", analysis.get("error"))
 
     return response
 
 
 @router.post("/generate-caption", response_model=CaptionGenerationResponse)
-async def generate_general_caption(request: GenerateCaptionRequest):
+async def generate_general_caption(request: GenerateCaptionRequest, llm_service=Depends(_llm)):
     """
     STEP 2 (General Flow): Generate caption for general post
 
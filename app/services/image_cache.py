@@ -0,0 +1,98 @@
+# Caches upload-ready JPEG bytes in Redis so reposting the same image skips the disk read + resize + encode
+
+from PIL import Image
+from io import BytesIO
+from pathlib import Path
+from typing import Optional, Tuple
+import hashlib
+import logging
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class ImageCache:
+    """
+    Resized image bytes keyed on (path, mtime, target size).
+    Works without Redis too: REDIS_URL unset -> the original file bytes are returned untouched
+    (nowhere to keep the result, so a resize + re-encode on every post would be pure overhead).
+    """
+
+    def __init__(self):
+        self.settings = get_settings()
+        self.ttl = self.settings.image_cache_ttl
+        self._redis = None
+
+        if self.settings.redis_url:
+            try:
+                import redis  # only needed when a cache is configured
+                # Short timeouts -> a dead Redis costs a post ~1s, not a hung upload thread
+                self._redis = redis.Redis.from_url(
+                    self.settings.redis_url,
+                    socket_connect_timeout=1.0,
+                    socket_timeout=1.0
+                )
+                logger.info("Image cache: Redis enabled")
+            except Exception as e:
+                logger.warning("Image cache disabled, Redis unavailable: %s", e)
+
+    def _key(self, image_path: Path, max_size: Tuple[int, int]) -> str:
+        # mtime in the key -> an edited file never returns stale bytes
+        stat = image_path.stat()
+        raw = f"{image_path.resolve()}|{stat.st_mtime_ns}|{max_size[0]}x{max_size[1]}"
+        return "img:" + hashlib.sha256(raw.encode()).hexdigest()
+
+    def get_jpeg(self, image_path: Path, max_size: Tuple[int, int] = (1080, 1350)) -> bytes:
+        """JPEG bytes of image_path, shrunk to fit max_size (aspect ratio kept); original bytes without Redis"""
+        if self._redis is None:
+            return image_path.read_bytes()
+
+        key = self._key(image_path, max_size)
+
+        cached = self._get(key)
+        if cached is not None:
+            logger.info("Image cache hit: %s", image_path.name)
+            return cached
+
+        with Image.open(image_path) as image:
+            image.draft("RGB", max_size)  # JPEG: decode at reduced scale when possible
+            image = self._flatten(image)
+        image.thumbnail(max_size, Image.Resampling.LANCZOS)
+
+        buffer = BytesIO()
+        image.save(buffer, format="JPEG", quality=90)
+        data = buffer.getvalue()
+
+        self._set(key, data)
+        return data
+
+    @staticmethod
+    def _flatten(image: Image.Image) -> Image.Image:
+        # Transparent pixels onto white (same as ImageService) -> convert("RGB") alone turns them black
+        if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+            image = image.convert('RGBA')
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel('A'))
+            return background
+        return image.convert('RGB')
+
+    def _get(self, key: str) -> Optional[bytes]:
+        if self._redis is None:
+            return None
+        try:
+            return self._redis.get(key)
+        except Exception as e:
+            logger.warning("Image cache read failed: %s", e)
+            return None
+
+    def _set(self, key: str, data: bytes):
+        if self._redis is None:
+            return
+        try:
+            self._redis.setex(key, self.ttl, data)
+        except Exception as e:
+            logger.warning("Image cache write failed: %s", e)
+
+
+# Singleton — one instance shared across the app
+image_cache = ImageCache()
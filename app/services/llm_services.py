@@ -1,19 +1,24 @@
 # This file generates product images and captions with hashtags
-from openai import OpenAI
-from typing import Optional, Dict, Any
+from openai import OpenAI, AsyncOpenAI
+import httpx
+import asyncio
+from typing import Optional, Dict, Any, List, Callable, Iterator
 import logging
 import base64
+import re
 from pathlib import Path
-import sys
 from app.config import get_settings
 
-# Add parent directory to path so we can import config
-sys.path.append(str(Path(__file__).parent.parent))
-
-# Setup logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured once by the application (app/main.py)
 logger = logging.getLogger(__name__)
 
+# Whole SMP emoji block (mahjong/cards, enclosed alphanumerics like 🅰, regional-indicator flags, pictographs ..
+# extended pictographs) + misc symbols & dingbats (☀ ✨ ✅ ...)
+_EMOJI_RE = re.compile(r"[\U0001F000-\U0001FAFF\U00002600-\U000027BF]")
+
+# Saved upload suffix -> MIME type for the inline image sent to the vision model
+_IMAGE_MIME = {".png": "image/png", ".webp": "image/webp"}
+
 
 class LLMService:
 
@@ -23,26 +28,58 @@ class LLMService:
 
         # Initialize OpenAI client only if API key is available
         if self.settings.openai_api_key:
-            self.client = OpenAI(api_key=self.settings.openai_api_key)
+            # One pooled HTTP/2 client per process -> TLS sessions are reused across GPT/DALL-E calls
+            self.client = OpenAI(
+                api_key=self.settings.openai_api_key,
+                http_client=httpx.Client(
+                    http2=True,
+                    limits=httpx.Limits(max_keepalive_connections=100, max_connections=200),
+                    timeout=httpx.Timeout(60.0, connect=5.0)
+                )
+            )
+            # Async twin -> lets batch calls overlap their round trips on the same pooled connections
+            self.aclient = AsyncOpenAI(
+                api_key=self.settings.openai_api_key,
+                http_client=httpx.AsyncClient(
+                    http2=True,
+                    limits=httpx.Limits(max_keepalive_connections=16),
+                    timeout=httpx.Timeout(60.0, connect=5.0)
+                )
+            )
             logger.info("OpenAI client initialized successfully")
         else:
             self.client = None
+            self.aclient = None
             logger.warning("OpenAI API key not found. AI features disabled.")
 
-# ------------------------- Enhancing user prompt -----------------------------------------------
-def enhance_user_prompt(self, product_description: str , style:str ) -> str:
-    user_message = f"Prduct: {product_description}\nStyle: {style}"
-    response = self.client.chat.completions.cretae(
-        model=self.settings.openai_model,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user" , "content": user_message}
-        ],
-        max_tokens = 30
-    )
-    return reponse.choices[0].message.content.strip()
- 
- # ----------------------- Generating Image -----------------------------------
+    async def close(self):
+        """Close the pooled HTTP connections (called on app shutdown)"""
+        if self.client is not None:
+            self.client.close()
+        if self.aclient is not None:
+            await self.aclient.close()
+
+    def _check_client(self):
+        if self.client is None:
+            raise Exception("OpenAI client not initialized. Set OPENAI_API_KEY to enable AI features.")
+
+    # ------------------------- Enhancing user prompt -----------------------------------------------
+    def enhance_user_prompt(self, product_description: str, style: str) -> str:
+        self._check_client()
+
+        system_prompt = "Rewrite the product description as a short, vivid image prompt in the given style."
+        user_message = f"Product: {product_description}\nStyle: {style}"
+        response = self.client.chat.completions.create(
+            model=self.settings.openai_model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_message}
+            ],
+            max_tokens=30
+        )
+        return response.choices[0].message.content.strip()
+
+    # ----------------------- Generating Image -----------------------------------
 
     def generate_product_image(
         self,
@@ -117,7 +154,7 @@ def enhance_user_prompt(self, product_description: str , style:str ) -> str:
 
         return " ".join(prompt_parts)
 
-   # ----------------------- Generating Caption -----------------------------------
+    # ----------------------- Generating Caption -----------------------------------
     def generate_caption(
         self,
         content_type: str,  # "advertisement" or "general"
@@ -140,57 +177,190 @@ def enhance_user_prompt(self, product_description: str , style:str ) -> str:
             # Call GPT API
             response = self.client.chat.completions.create(
                 model=self.settings.openai_model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "You are a professional social media content creator. "
-                            "Create engaging, authentic captions that drive engagement. "
-                            "Use emojis naturally and include relevant hashtags."
-                        )
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
+                messages=self._caption_messages(prompt),
                 temperature=0.8,  # Creative but not too random
                 max_tokens=500
             )
 
             # Extract the generated caption
             full_text = response.choices[0].message.content.strip()
+            return self._caption_result(full_text, include_hashtags)
 
-            # Parse caption and hashtags
-            caption, hashtags = self._parse_caption_response(
-                full_text, include_hashtags
-            )
+        except Exception as e:
+            logger.error(f"Caption generation failed: {str(e)}")
+            raise Exception(f"Failed to generate caption: {str(e)}")
 
-            # Count emojis (simple check for common emoji ranges)
-            emoji_count = sum(
-                1 for char in caption
-                if ord(char) > 127000  # Simplified emoji detection
+    def stream_caption(
+        self,
+        content_type: str,
+        content_info: Dict[str, Any],
+        tone: str = "engaging",
+        include_hashtags: bool = True,
+        max_hashtags: int = 10,
+        on_complete: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Iterator[str]:
+        """
+        Same as generate_caption, but yields text pieces as GPT produces them.
+
+        Once the stream ends the full text is parsed like generate_caption does.
+        on_complete then receives the usual result dict (caption, hashtags, counts).
+
+        Example (FastAPI):
+            return StreamingResponse(llm_service.stream_caption("general", info), media_type="text/plain")
+        """
+        self._check_client()
+
+        prompt = self._build_caption_prompt(
+            content_type, content_info, tone, include_hashtags, max_hashtags
+        )
+
+        logger.info(f"Streaming caption for {content_type}...")
+
+        # Open the stream here (not inside the generator) -> a missing key / API error surfaces
+        # when stream_caption is called, before a StreamingResponse has sent its headers
+        try:
+            response = self.client.chat.completions.create(
+                model=self.settings.openai_model,
+                messages=self._caption_messages(prompt),
+                temperature=0.8,
+                max_tokens=500,
+                stream=True  # first tokens arrive in ~200ms instead of after the whole caption
             )
+        except Exception as e:
+            logger.error(f"Caption streaming failed: {str(e)}")
+            raise Exception(f"Failed to generate caption: {str(e)}")
 
-            result = {
-                "caption": caption,
-                "hashtags": hashtags,
-                "full_text": full_text,
-                "emoji_count": emoji_count,
-                "character_count": len(caption),
-                "success": True
-            }
+        return self._stream_parts(response, include_hashtags, on_complete)
 
-            logger.info(f"Caption generated: {len(caption)} chars, {len(hashtags)} hashtags")
-            return result
+    def _stream_parts(
+        self,
+        response,
+        include_hashtags: bool,
+        on_complete: Optional[Callable[[Dict[str, Any]], None]]
+    ) -> Iterator[str]:
+        parts = []
+        try:
+            for chunk in response:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content or ""
+                if delta:
+                    parts.append(delta)
+                    yield delta
 
         except Exception as e:
-            logger.error(f"Caption generation failed: {str(e)}")
+            logger.error(f"Caption streaming failed: {str(e)}")
             raise Exception(f"Failed to generate caption: {str(e)}")
 
-   # ----------------------- Coversational Messages -----------------------------------
- 
- def chat(self, messages: list, system_prompt: str = None) -> str:
+        result = self._caption_result("".join(parts).strip(), include_hashtags)
+        if on_complete is not None:
+            on_complete(result)
+
+    async def generate_captions_batch(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Generate several captions concurrently (one post per item).
+
+        items = [
+            {"content_type": "advertisement", "content_info": {...}, "tone": "fun"},
+            {"content_type": "general", "content_info": {...}}
+        ]
+        Each item takes the same keyword arguments as generate_caption.
+        Results come back in the same order as items.
+        """
+        self._check_client()
+
+        async def one(item: Dict[str, Any]) -> Dict[str, Any]:
+            include_hashtags = item.get("include_hashtags", True)
+            prompt = self._build_caption_prompt(
+                item["content_type"],
+                item["content_info"],
+                item.get("tone", "engaging"),
+                include_hashtags,
+                item.get("max_hashtags", 10)
+            )
+            response = await self.aclient.chat.completions.create(
+                model=self.settings.openai_model,
+                messages=self._caption_messages(prompt),
+                temperature=0.8,
+                max_tokens=500
+            )
+            return self._caption_result(response.choices[0].message.content.strip(), include_hashtags)
+
+        logger.info(f"Generating {len(items)} captions concurrently...")
+
+        try:
+            # All requests in flight at once -> total time ~ slowest call instead of the sum
+            return list(await asyncio.gather(*(one(item) for item in items)))
+        except Exception as e:
+            logger.error(f"Batch caption generation failed: {str(e)}")
+            raise Exception(f"Failed to generate captions: {str(e)}")
+
+    def _build_caption_prompt(
+        self,
+        content_type: str,
+        content_info: Dict[str, Any],
+        tone: str,
+        include_hashtags: bool,
+        max_hashtags: int
+    ) -> str:
+
+        prompt_parts = [f"Write a {tone} social media caption for this {content_type} post."]
+        prompt_parts.extend(f"{key.replace('_', ' ').capitalize()}: {value}" for key, value in content_info.items() if value)
+
+        if include_hashtags:
+            prompt_parts.append(f"End with up to {max_hashtags} relevant hashtags on a separate line.")
+        else:
+            prompt_parts.append("Do not include hashtags.")
+
+        return "\n".join(prompt_parts)
+
+    def _parse_caption_response(self, full_text: str, include_hashtags: bool):
+        if not include_hashtags:
+            return full_text, []
+
+        # Hashtags anywhere in the text; caption is what's left once they're stripped out
+        hashtags = re.findall(r"#\w+", full_text)
+        caption = re.sub(r"\s*#\w+", "", full_text).strip()
+        return caption, hashtags
+
+    def _caption_messages(self, prompt: str) -> List[Dict[str, str]]:
+        return [
+            {
+                "role": "system",
+                "content": (
+                    "You are a professional social media content creator. "
+                    "Create engaging, authentic captions that drive engagement. "
+                    "Use emojis naturally and include relevant hashtags."
+                )
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+
+    def _caption_result(self, full_text: str, include_hashtags: bool) -> Dict[str, Any]:
+        # Parse caption and hashtags
+        caption, hashtags = self._parse_caption_response(
+            full_text, include_hashtags
+        )
+
+        # Count emojis (common emoji ranges, scanned by the regex engine)
+        emoji_count = len(_EMOJI_RE.findall(caption))
+
+        logger.info(f"Caption generated: {len(caption)} chars, {len(hashtags)} hashtags")
+        return {
+            "caption": caption,
+            "hashtags": hashtags,
+            "full_text": full_text,
+            "emoji_count": emoji_count,
+            "character_count": len(caption),
+            "success": True
+        }
+
+    # ----------------------- Coversational Messages -----------------------------------
+
+    def chat(self, messages: list, system_prompt: str = None) -> str:
         """
         The chatbot brain — takes conversation history → returns next reply.
 
@@ -216,5 +386,50 @@ def enhance_user_prompt(self, product_description: str , style:str ) -> str:
         return response.choices[0].message.content.strip()
 
 
+    # ----------------------- Analyzing Images -----------------------------------
+
+    _ANALYSIS_PROMPTS = {
+        "caption_help": (
+            "Describe this image for a social media caption writer: the main subject, setting, "
+            "colors and mood, in 2-3 sentences. Then suggest 3 angles a caption could take."
+        ),
+    }
+
+    async def analyze_and_describe_image(self, image_path: Path, purpose: str = "caption_help") -> Dict[str, Any]:
+        """
+        Describe a saved image with the vision-capable chat model (gpt-4o by default).
+
+        The file is sent inline as a data URL (uploads under /static aren't reachable from OpenAI).
+        Never raises: returns {"success": False, "error": ...} so callers can just skip the analysis.
+        """
+        if self.aclient is None:
+            return {"success": False, "error": "OpenAI client not initialized"}
+
+        try:
+            image_bytes = await asyncio.to_thread(image_path.read_bytes)
+            mime = _IMAGE_MIME.get(image_path.suffix.lower(), "image/jpeg")
+            data_url = f"data:{mime};base64,{base64.b64encode(image_bytes).decode()}"
+
+            response = await self.aclient.chat.completions.create(
+                model=self.settings.openai_model,
+                messages=[{
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": self._ANALYSIS_PROMPTS.get(purpose, self._ANALYSIS_PROMPTS["caption_help"])},
+                        {"type": "image_url", "image_url": {"url": data_url, "detail": "low"}}  # low -> fixed small token cost
+                    ]
+                }],
+                max_tokens=300
+            )
+
+            analysis = response.choices[0].message.content.strip()
+            logger.info(f"Image analyzed: {image_path.name}")
+            return {"success": True, "analysis": analysis}
+
+        except Exception as e:
+            logger.error(f"Image analysis failed: {str(e)}")
+            return {"success": False, "error": str(e)}
+
+
 # Singleton — one instance shared across the app
 llm_service = LLMService()
\ No newline at end of file
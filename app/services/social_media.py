@@ -1,29 +1,144 @@
 
 
-from instagrapi import Client as InstaClient
-from instagrapi.exceptions import LoginRequired
-import facebook
+# instagrapi / facebook-sdk are heavy (requests, pydantic, PIL, moviepy...) -> imported on first login
+import requests
+import orjson
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib3.connection import HTTPConnection
+from requests_toolbelt import MultipartEncoder
+from io import BytesIO
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import logging
-from app.config import get_settings
-
-# Setup logging
-logging.basicConfig(level=logging.INFO)
+import asyncio
+import threading
+from functools import lru_cache
+import socket
+from concurrent.futures import ThreadPoolExecutor
+import time
+import sys
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
+from app.config import Settings, get_settings
+from app.utils.validators import detect_image_format
+
+# Logging is configured once by the application (app/main.py), not by library modules
 logger = logging.getLogger(__name__)
 
 
+# ============================================
+# RETRY POLICY (uploads only)
+# ============================================
+
+# Graph API error codes that mean "slow down" (app / user / page / action rate limits)
+_FB_RATE_LIMIT_CODES = {4, 17, 32, 613}
+
+# Max concurrent uploads per platform, shared by every caller in this process
+# (threading, not asyncio: uploads run on SocialMediaService's worker threads)
+# No Instagram entry: InstagramService._client_lock already serializes its uploads
+# (one instagrapi client / session per account, which isn't safe to share across threads anyway)
+_UPLOAD_SLOTS = {
+    "facebook": threading.BoundedSemaphore(2),
+}
+
+# Instagram sessions go stale after roughly an hour -> check proactively a bit before that
+_IG_SESSION_MAX_AGE = 55 * 60
+
+# Facebook serves photos at up to 2048px on the long side -> no point uploading more
+_FB_MAX_SIZE = (2048, 2048)
+
+_backoff = wait_exponential(multiplier=1, max=30)
+
+
+def _is_transient(exc: BaseException) -> bool:
+    """
+    Rate limits and failures before the request went out; everything else fails immediately.
+
+    Uploads are non-idempotent POSTs: after a 5xx / dropped connection the photo may already
+    be live, so those are never retried (a retry would double-post).
+    """
+    # An SDK that was never imported can't have raised -> look them up without importing
+    ig_errors = sys.modules.get("instagrapi.exceptions")
+    if ig_errors is not None and isinstance(exc, (ig_errors.ClientThrottledError, ig_errors.PleaseWaitFewMinutes)):
+        return True
+    fb_sdk = sys.modules.get("facebook")
+    if fb_sdk is not None and isinstance(exc, fb_sdk.GraphAPIError):
+        return getattr(exc, "code", None) in _FB_RATE_LIMIT_CODES
+    if isinstance(exc, requests.HTTPError):
+        return exc.response is not None and exc.response.status_code == 429
+    # Connection never established -> nothing was sent
+    return isinstance(exc, requests.ConnectTimeout)
+
+
+def _wait_retry_after(retry_state) -> float:
+    """Honor the server's Retry-After header when there is one, else exponential backoff"""
+    response = getattr(retry_state.outcome.exception(), "response", None)
+    retry_after = getattr(response, "headers", {}).get("Retry-After", "")
+    if retry_after.isdigit():
+        return min(float(retry_after), 30.0)
+    return _backoff(retry_state)
+
+
+class _UploadAdapter(HTTPAdapter):
+    """
+    HTTPAdapter for the photo-upload sessions: keeps urllib3's defaults (TCP_NODELAY is already on)
+    and adds a 1 MiB send buffer so multi-MB image bodies aren't throttled by the small default SO_SNDBUF.
+    """
+
+    _socket_options = HTTPConnection.default_socket_options + [
+        (socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20),
+    ]
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = self._socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+
+def _orjson_response_hook(response, *args, **kwargs):
+    """requests response hook: response.json() decodes with orjson (same result types, several x faster)"""
+    response.json = lambda **_: orjson.loads(response.content)
+    return response
+
+
+_upload_retry = retry(
+    retry=retry_if_exception(_is_transient),
+    stop=stop_after_attempt(5),
+    wait=_wait_retry_after,
+    reraise=True  # post_photo turns the final error into its usual result dict
+)
+
+
 class InstagramService:
     """
     Service for posting to Instagram using instagrapi.
     Uses private API (username/password login).
     """
 
-    def __init__(self):
+    _sdk = None  # (Client, LoginRequired) from instagrapi, imported once on first use
+
+    @classmethod
+    def _instagrapi(cls):
+        if cls._sdk is None:
+            from instagrapi import Client
+            from instagrapi.exceptions import LoginRequired
+            cls._sdk = (Client, LoginRequired)
+        return cls._sdk
+
+    def __init__(self, settings: Optional[Settings] = None):
         """Initialize Instagram client"""
-        self.settings = get_settings()
+        self.settings = settings or get_settings()
         self.client = None
         self._logged_in = False
+        # Saved instagrapi session (cookies, device ids) -> later logins skip the password round trip
+        self.session_path = self.settings.cache_dir / "ig_session.json"
+        # Proactive session refresh (background timer, so posts don't hit an expired session)
+        self._login_ts = 0.0
+        self._refresh_timer: Optional[threading.Timer] = None
+        # One lock around everything that touches self.client's session (refresh, relogin, upload)
+        # -> the timer thread never swaps the session out from under an in-flight upload,
+        # and it's the Instagram concurrency limit too: one upload at a time per account
+        # (reentrant: _refresh_session and post_photo call _relogin while holding it)
+        self._client_lock = threading.RLock()
 
     def login(self) -> bool:
         """
@@ -32,7 +147,7 @@ class InstagramService:
         Returns:
             True if login successful, False otherwise
         """
-        if not self.settings.is_instagram_configured():
+        if not self.settings.is_instagram_configured:
             logger.warning("⚠️  Instagram not configured")
             return False
 
@@ -40,39 +155,113 @@ class InstagramService:
             logger.info("✓ Already logged in to Instagram")
             return True
 
+        InstaClient, LoginRequired = self._instagrapi()
+
         try:
             logger.info("Logging in to Instagram...")
 
             self.client = InstaClient()
+
+            # instagrapi parses every API response with response.json() -> orjson on its own sessions only
+            # same sessions carry the photo uploads -> bigger send buffer (see _UploadAdapter)
+            # keep instagrapi's own Retry (429/5xx backoff) on the replacement adapter
+            for session in (self.client.private, self.client.public):
+                session.hooks["response"].append(_orjson_response_hook)
+                session.mount("https://", _UploadAdapter(max_retries=session.get_adapter("https://").max_retries))
+
+            # Reuse the saved session if we have one (login() then only refreshes it)
+            if self.session_path.exists():
+                try:
+                    self.client.load_settings(self.session_path)
+                    logger.info("Loaded saved Instagram session")
+                except Exception as e:
+                    logger.warning("Ignoring unreadable Instagram session file: %s", e)
+
             self.client.login(
                 self.settings.instagram_username,
                 self.settings.instagram_password
             )
+            self._save_session()
 
             self._logged_in = True
+            self._login_ts = time.monotonic()
+            self._schedule_refresh()
             logger.info("✓ Instagram login successful")
             return True
 
         except LoginRequired as e:
-            logger.error(f"Instagram login failed: {str(e)}")
+            logger.error("Instagram login failed: %s", e)
             return False
         except Exception as e:
-            logger.error(f"Instagram login error: {str(e)}")
+            logger.error("Instagram login error: %s", e)
             return False
 
+    def _save_session(self):
+        """Persist the current session so the next process start doesn't log in from scratch"""
+        try:
+            self.client.dump_settings(self.session_path)
+        except Exception as e:
+            logger.warning("Could not save Instagram session: %s", e)
+
+    def _relogin(self):
+        """Saved session expired -> full login once, then save the fresh session"""
+        logger.info("Instagram session expired, logging in again...")
+        with self._client_lock:
+            self.client.relogin()
+            # instagrapi refuses a 2nd relogin() per client unless the counter is reset
+            self.client.relogin_attempt = 0
+            self._save_session()
+            self._login_ts = time.monotonic()
+            self._schedule_refresh()  # fresh session -> next check a full max-age from now
+
+    def _schedule_refresh(self, delay: float = _IG_SESSION_MAX_AGE):
+        """(Re)arm the background session check"""
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+        self._refresh_timer = threading.Timer(delay, self._refresh_session)
+        self._refresh_timer.daemon = True  # never keeps the process alive on shutdown
+        self._refresh_timer.start()
+
+    def _refresh_session(self):
+        """Cheap authenticated call; log in again only if Instagram says the session is gone"""
+        if not self._logged_in:
+            return
+
+        _, LoginRequired = self._instagrapi()
+        with self._client_lock:
+            try:
+                # Another thread refreshed while we waited for the lock
+                if time.monotonic() - self._login_ts < _IG_SESSION_MAX_AGE:
+                    return
+                self.client.get_timeline_feed()
+                self._login_ts = time.monotonic()
+            except LoginRequired:
+                try:
+                    self._relogin()
+                except Exception as e:
+                    logger.warning("Instagram session refresh failed: %s", e)
+            except Exception as e:
+                logger.warning("Instagram session check failed: %s", e)
+            finally:
+                # Always re-arm, for whatever age the session has left
+                # (at least a minute, so a failing check doesn't spin)
+                age = time.monotonic() - self._login_ts
+                self._schedule_refresh(max(_IG_SESSION_MAX_AGE - age, 60.0))
+
     def post_photo(
             self,
             image_path: Path,
             caption: str,
-            hashtags: Optional[List[str]] = None
+            hashtag_count: int = 0
     ) -> Dict[str, Any]:
         """
         Post a photo to Instagram.
 
         Args:
             image_path: Path to image file
-            caption: Post caption
-            hashtags: List of hashtags (e.g., ["#fashion", "#style"])
+            caption: Final caption, hashtags included and within Instagram's 2,200 chars
+                     (SocialMediaService.post_to_platforms builds it)
+            hashtag_count: Number of hashtags in the caption (reported back in the result)
 
         Returns:
             Dictionary with post results
@@ -80,8 +269,8 @@ class InstagramService:
         Example:
             result = instagram.post_photo(
                 image_path=Path("product.jpg"),
-                caption="Check out our new product!",
-                hashtags=["#newproduct", "#sale"]
+                caption="Check out our new product!\n\n#newproduct #sale",
+                hashtag_count=2
             )
         """
         # Ensure logged in
@@ -92,26 +281,20 @@ class InstagramService:
                     "error": "Not logged in to Instagram"
                 }
 
+        # Timer didn't get to it yet (e.g. process was suspended) -> check before posting
+        if time.monotonic() - self._login_ts > _IG_SESSION_MAX_AGE:
+            self._refresh_session()
+
         try:
-            # Build full caption with hashtags
-            full_caption = caption
-            if hashtags:
-                # Add hashtags at the end
-                hashtag_text = " ".join(hashtags)
-                full_caption = f"{caption}\n\n{hashtag_text}"
-
-            # Ensure caption is within Instagram limit (2,200 characters)
-            if len(full_caption) > 2200:
-                logger.warning("Caption too long, truncating...")
-                full_caption = full_caption[:2197] + "..."
-
-            logger.info(f"Posting to Instagram: {image_path.name}")
-
-            # Upload photo
-            media = self.client.photo_upload(
-                path=str(image_path),
-                caption=full_caption
-            )
+            logger.info("Posting to Instagram: %s", image_path.name)
+
+            # Upload photo (a stale saved session only shows up on the first real API call)
+            _, LoginRequired = self._instagrapi()
+            try:
+                media = self._upload(image_path, caption)
+            except LoginRequired:
+                self._relogin()
+                media = self._upload(image_path, caption)
 
             result = {
                 "success": True,
@@ -119,23 +302,38 @@ class InstagramService:
                 "media_id": media.id,
                 "media_code": media.code,
                 "url": f"https://www.instagram.com/p/{media.code}/",
-                "caption_length": len(full_caption),
-                "hashtag_count": len(hashtags) if hashtags else 0
+                "caption_length": len(caption),
+                "hashtag_count": hashtag_count
             }
 
-            logger.info(f"✓ Posted to Instagram: {result['url']}")
+            logger.info("✓ Posted to Instagram: %s", result['url'])
             return result
 
         except Exception as e:
-            logger.error(f"❌ Instagram post failed: {str(e)}")
+            logger.error("❌ Instagram post failed: %s", e)
             return {
                 "success": False,
                 "platform": "instagram",
                 "error": str(e)
             }
 
+    @_upload_retry
+    def _upload(self, image_path: Path, caption: str):
+        with self._client_lock:
+            return self.client.photo_upload(
+                path=str(image_path),
+                caption=caption
+            )
+
+    def close(self):
+        """Stop the background session refresh (session itself stays saved on disk)"""
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+            self._refresh_timer = None
+
     def logout(self):
         """Logout from Instagram"""
+        self.close()
         if self.client and self._logged_in:
             self.client.logout()
             self._logged_in = False
@@ -148,11 +346,23 @@ class FacebookService:
     Requires Page Access Token.
     """
 
-    def __init__(self):
+    _sdk = None  # facebook-sdk module, imported once on first initialize()
+
+    _GRAPH_VERSION = "3.0"
+
+    @classmethod
+    def _facebook(cls):
+        if cls._sdk is None:
+            import facebook
+            cls._sdk = facebook
+        return cls._sdk
+
+    def __init__(self, settings: Optional[Settings] = None):
         """Initialize Facebook Graph API client"""
-        self.settings = get_settings()
+        self.settings = settings or get_settings()
         self.graph = None
         self._initialized = False
+        self._session = None
 
     def initialize(self) -> bool:
         """
@@ -161,7 +371,7 @@ class FacebookService:
         Returns:
             True if initialization successful
         """
-        if not self.settings.is_facebook_configured():
+        if not self.settings.is_facebook_configured:
             logger.warning("⚠️  Facebook not configured")
             return False
 
@@ -172,9 +382,19 @@ class FacebookService:
         try:
             logger.info("Initializing Facebook Graph API...")
 
-            self.graph = facebook.GraphAPI(
+            # Keep-alive pool -> get_object / put_photo reuse the TLS connection to graph.facebook.com
+            if self._session is None:  # a failed initialize() keeps its pool for the next attempt
+                self._session = requests.Session()
+                self._session.mount("https://", _UploadAdapter(
+                    pool_connections=4,
+                    pool_maxsize=8,
+                    max_retries=Retry(total=3, backoff_factor=0.5)
+                ))
+
+            self.graph = self._facebook().GraphAPI(
                 access_token=self.settings.facebook_access_token,
-                version="3.0"
+                version=self._GRAPH_VERSION,
+                session=self._session
             )
 
             # Test the connection
@@ -185,7 +405,7 @@ class FacebookService:
             return True
 
         except Exception as e:
-            logger.error(f"❌ Facebook initialization failed: {str(e)}")
+            logger.error("❌ Facebook initialization failed: %s", e)
             return False
 
     def post_photo(
@@ -218,15 +438,14 @@ class FacebookService:
                 }
 
         try:
-            logger.info(f"Posting to Facebook: {image_path.name}")
-
-            # Open image file
-            with open(image_path, 'rb') as image_file:
-                # Upload photo to Facebook page
-                response = self.graph.put_photo(
-                    image=image_file,
-                    message=message
-                )
+            logger.info("Posting to Facebook: %s", image_path.name)
+
+            # Upload-ready bytes (Redis-cached JPEG -> reposting the same file skips read + resize + encode)
+            from app.services.image_cache import image_cache
+            image_bytes = image_cache.get_jpeg(image_path, _FB_MAX_SIZE)
+
+            # Upload photo to Facebook page
+            response = self._upload(image_bytes, message)
 
             result = {
                 "success": True,
@@ -235,11 +454,11 @@ class FacebookService:
                 "message_length": len(message)
             }
 
-            logger.info(f"✓ Posted to Facebook: {response.get('id', 'unknown')}")
+            logger.info("✓ Posted to Facebook: %s", response.get('id', 'unknown'))
             return result
 
         except Exception as e:
-            logger.error(f"❌ Facebook post failed: {str(e)}")
+            logger.error("❌ Facebook post failed: %s", e)
             return {
                 "success": False,
                 "platform": "facebook",
@@ -247,6 +466,48 @@ class FacebookService:
             }
 
 
+    @_upload_retry
+    def _upload(self, image_bytes: bytes, message: str) -> Dict[str, Any]:
+        # Direct multipart POST on the pooled session. MultipartEncoder streams the body from the
+        # BytesIO instead of building one big request body in memory (requests' files= / put_photo do)
+        # Fresh stream per attempt -> a retry never sends a half-consumed file
+        # Without Redis image_cache hands back the original file -> label it with its real type
+        image_format = detect_image_format(image_bytes[:12]) or "jpeg"
+        body = MultipartEncoder(fields={
+            "access_token": self.settings.facebook_access_token,
+            "message": message,
+            "source": (f"photo.{image_format}", BytesIO(image_bytes), f"image/{image_format}"),
+        })
+
+        with _UPLOAD_SLOTS["facebook"]:
+            response = self._session.post(
+                f"https://graph.facebook.com/v{self._GRAPH_VERSION}/{self.settings.facebook_page_id}/photos",
+                data=body,
+                headers={"Content-Type": body.content_type},
+                timeout=60
+            )
+
+        try:
+            result = response.json()
+        except ValueError:
+            response.raise_for_status()  # non-JSON error page -> HTTPError (retried only if 429)
+            raise
+
+        if "error" in result:
+            # Same exception put_photo raised -> rate limit codes still trigger the retry policy
+            raise self._facebook().GraphAPIError(result)
+        response.raise_for_status()
+        return result
+
+    def close(self):
+        """Close the pooled Graph API connections (called on app shutdown)"""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        self.graph = None
+        self._initialized = False
+
+
 class SocialMediaService:
     """
     Unified service for posting to multiple platforms.
@@ -256,8 +517,16 @@ class SocialMediaService:
     def __init__(self):
         """Initialize all social media services"""
         self.settings = get_settings()
-        self.instagram = InstagramService()
-        self.facebook = FacebookService()
+        # Hand the same Settings object down instead of each service looking it up again
+        self.instagram = InstagramService(self.settings)
+        self.facebook = FacebookService(self.settings)
+        # Own bounded pool for the blocking SDK calls -> a burst of posts can't open
+        # as many IG/FB connections as the default executor has threads
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="social")
+
+    def _in_thread(self, func, *args) -> "asyncio.Future":
+        """Run a blocking call on the service's executor (awaitable)"""
+        return asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
 
     def post_to_platforms(
             self,
@@ -273,7 +542,7 @@ class SocialMediaService:
             platforms: List of platforms ("instagram", "facebook", or "both")
             image_path: Path to image
             caption: Post caption/message
-            hashtags: List of hashtags (for Instagram)
+            hashtags: List of hashtags (appended to the caption on every platform)
 
         Returns:
             Dictionary with results from each platform
@@ -285,23 +554,67 @@ class SocialMediaService:
                 caption="New product launch!",
                 hashtags=["#newproduct", "#launch"]
             )
+
+        Sync entry point for scripts. Inside an event loop (FastAPI routes) await post_to_platforms_async instead.
         """
-        # Normalize platforms list
-        if "both" in platforms:
-            platforms = ["instagram", "facebook"]
+        return asyncio.run(
+            self.post_to_platforms_async(platforms, image_path, caption, hashtags)
+        )
+
+    async def post_to_platforms_async(
+            self,
+            platforms: List[str],
+            image_path: Path,
+            caption: str,
+            hashtags: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Same as post_to_platforms, but the uploads run concurrently.
+        Total time is the slower of the two uploads instead of both added together.
+        """
+        # Normalize platforms (set -> a platform listed twice is still posted once)
+        requested = set(platforms)
+        if "both" in requested:
+            requested = {"instagram", "facebook"}
 
         results = {
-            "requested_platforms": platforms,
+            "requested_platforms": sorted(requested),
             "results": {},
             "overall_success": False
         }
 
+        # Check the file once for all platforms -> a missing / non-image file fails fast, same error everywhere
+        image_error = self._check_image(image_path)
+        targets = requested
+        if image_error:
+            targets = set()
+            for platform in sorted(requested):
+                results["results"][platform] = {
+                    "success": False,
+                    "platform": platform,
+                    "error": image_error
+                }
+
+        # Hashtags joined once, shared by both platforms
+        hashtag_text = " ".join(hashtags) if hashtags else ""
+        full_caption = f"{caption}\n\n{hashtag_text}" if hashtag_text else caption
+
+        # Blocking SDK calls -> run on the service executor, one job per platform
+        jobs = {}
+
         # Post to Instagram
-        if "instagram" in platforms:
-            if self.settings.instagram_enabled and self.settings.is_instagram_configured():
-                logger.info("Posting to Instagram...")
-                ig_result = self.instagram.post_photo(image_path, caption, hashtags)
-                results["results"]["instagram"] = ig_result
+        if "instagram" in targets:
+            if self.settings.instagram_enabled and self.settings.is_instagram_configured:
+                # Ensure caption is within Instagram limit (2,200 characters)
+                ig_caption = full_caption
+                caption_len = len(ig_caption)  # computed once, used by the check and the log
+                if caption_len > 2200:
+                    logger.debug("Caption too long (%d chars), truncating...", caption_len)
+                    ig_caption = ig_caption[:2197] + "..."
+
+                jobs["instagram"] = self._in_thread(
+                    self.instagram.post_photo, image_path, ig_caption, len(hashtags) if hashtags else 0
+                )
             else:
                 results["results"]["instagram"] = {
                     "success": False,
@@ -309,67 +622,108 @@ class SocialMediaService:
                 }
 
         # Post to Facebook
-        if "facebook" in platforms:
-            if self.settings.facebook_enabled and self.settings.is_facebook_configured():
-                logger.info("Posting to Facebook...")
-
-                # For Facebook, include hashtags in message
-                fb_message = caption
-                if hashtags:
-                    fb_message = f"{caption}\n\n{' '.join(hashtags)}"
-
-                fb_result = self.facebook.post_photo(image_path, fb_message)
-                results["results"]["facebook"] = fb_result
+        if "facebook" in targets:
+            if self.settings.facebook_enabled and self.settings.is_facebook_configured:
+                # For Facebook, include hashtags in message (no length limit to apply)
+                jobs["facebook"] = self._in_thread(
+                    self.facebook.post_photo, image_path, full_caption
+                )
             else:
                 results["results"]["facebook"] = {
                     "success": False,
                     "error": "Facebook not configured or disabled"
                 }
 
-        # Check if at least one platform succeeded
-        results["overall_success"] = any(
-            r.get("success", False)
-            for r in results["results"].values()
-        )
+        if jobs:
+            logger.info("Posting to %s...", ", ".join(jobs))
+            outcomes = await asyncio.gather(*jobs.values(), return_exceptions=True)
+
+            for platform, outcome in zip(jobs, outcomes):
+                # post_photo already turns API errors into a result dict; this catches anything else
+                if isinstance(outcome, Exception):
+                    outcome = {
+                        "success": False,
+                        "platform": platform,
+                        "error": str(outcome)
+                    }
+                results["results"][platform] = outcome
+
+        # Summary (one pass over the results)
+        successful, failed = [], []
+        for platform, result in results["results"].items():
+            (successful if result.get("success", False) else failed).append(platform)
 
-        # Summary
-        successful = [
-            platform for platform, result in results["results"].items()
-            if result.get("success", False)
-        ]
-        failed = [
-            platform for platform, result in results["results"].items()
-            if not result.get("success", False)
-        ]
+        # Check if at least one platform succeeded
+        results["overall_success"] = bool(successful)
 
         results["summary"] = {
             "successful": successful,
             "failed": failed,
-            "total_requested": len(platforms),
+            "total_requested": len(requested),
             "total_successful": len(successful),
             "total_failed": len(failed)
         }
 
         if results["overall_success"]:
-            logger.info(f"✓ Posted to: {', '.join(successful)}")
+            logger.info("✓ Posted to: %s", ", ".join(successful))
 
         if failed:
-            logger.warning(f"⚠️  Failed to post to: {', '.join(failed)}")
+            logger.warning("⚠️  Failed to post to: %s", ", ".join(failed))
 
         return results
 
-    def get_available_platforms(self) -> List[str]:
-        """Get list of configured and enabled platforms"""
-        return self.settings.get_enabled_platforms()
+    def _check_image(self, image_path: Path) -> Optional[str]:
+        """Error message if image_path isn't a readable JPEG / PNG / WebP (reads only the header)"""
+        try:
+            with open(image_path, "rb") as image_file:
+                header = image_file.read(16)
+        except OSError as e:
+            return f"Cannot read image: {str(e)}"
+
+        if detect_image_format(header) is None:
+            return "Unsupported or corrupt image (expected JPEG, PNG or WebP)"
+        return None
+
+    async def warm_up(self):
+        """
+        Log in to every enabled platform in parallel (started in the background at app startup),
+        so the first post doesn't pay the login cost. Already logged in -> no-op.
+        Platforms with template credentials / WARM_UP_ON_STARTUP=false are skipped (settings.warm_up_platforms).
+        """
+        jobs = {}
+        if "instagram" in self.settings.warm_up_platforms:
+            jobs["instagram"] = self._in_thread(self.instagram.login)
+        if "facebook" in self.settings.warm_up_platforms:
+            jobs["facebook"] = self._in_thread(self.facebook.initialize)
+
+        outcomes = await asyncio.gather(*jobs.values(), return_exceptions=True)
+        for platform, outcome in zip(jobs, outcomes):
+            if outcome is not True:
+                # Not fatal: post_photo retries the login on first use
+                logger.warning("⚠️  %s warm-up failed: %s", platform, outcome)
+
+    def close(self):
+        """Release pooled connections and timers held by the platform clients"""
+        self.instagram.close()
+        self.facebook.close()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def get_available_platforms(self) -> Tuple[str, ...]:
+        """Get configured and enabled platforms (precomputed when settings load; immutable, no copy per call)"""
+        return self.settings.enabled_platforms
 
 
 # ============================================
-# SINGLETON INSTANCES
+# SHARED INSTANCE
 # ============================================
+# Nothing is built at import time: the service (settings, clients, executor) is created on the
+# first get_social_media_service() call and lives until close(). Use .instagram / .facebook on it
+# for single-platform calls, so there is still only one login / connection pool per process.
 
-social_media_service = SocialMediaService()
-instagram_service = InstagramService()
-facebook_service = FacebookService()
+@lru_cache(maxsize=1)
+def get_social_media_service() -> SocialMediaService:
+    """Process-wide SocialMediaService, created on first use"""
+    return SocialMediaService()
 
 
 # ============================================
@@ -378,12 +732,12 @@ facebook_service = FacebookService()
 
 def post_to_platforms(*args, **kwargs):
     """Convenience function for multi-platform posting"""
-    return social_media_service.post_to_platforms(*args, **kwargs)
+    return get_social_media_service().post_to_platforms(*args, **kwargs)
 
 
 def get_available_platforms():
     """Get list of available platforms"""
-    return social_media_service.get_available_platforms()
+    return get_social_media_service().get_available_platforms()
 
 
 # ============================================
@@ -395,7 +749,7 @@ if __name__ == "__main__":
     print("📱 Social Media Service Test")
     print("=" * 60)
 
-    service = SocialMediaService()
+    service = get_social_media_service()
 
     print(f"✓ Social Media Service initialized")
 
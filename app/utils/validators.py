@@ -0,0 +1,17 @@
+from typing import Optional
+
+
+def detect_image_format(header: bytes) -> Optional[str]:
+    """
+    Identify an image from its first bytes (magic numbers).
+
+    Returns "jpeg", "png", "webp" or None if the header matches none of them.
+    Only needs the first 12 bytes, so uploads can be rejected before they are fully read.
+    """
+    if header.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "webp"
+    return None
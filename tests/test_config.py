@@ -0,0 +1,50 @@
+# Settings must load from real env values (comma-separated lists in .env, not JSON)
+from app.config import Settings
+
+
+def test_list_settings_load_from_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("CORS_ORIGINS", "http://a.com, http://b.com")
+    monkeypatch.setenv("ALLOWED_IMAGE_FORMATS", "JPG, png")
+
+    settings = Settings(_env_file=None, base_dir=tmp_path)
+
+    assert settings.cors_origins == frozenset({"http://a.com", "http://b.com"})
+    assert settings.allowed_image_formats == frozenset({"jpg", "png"})
+
+
+def test_list_settings_load_from_env_file(monkeypatch, tmp_path):
+    monkeypatch.delenv("CORS_ORIGINS", raising=False)
+    monkeypatch.delenv("ALLOWED_IMAGE_FORMATS", raising=False)
+    env_file = tmp_path / ".env"
+    env_file.write_text("CORS_ORIGINS=*\nALLOWED_IMAGE_FORMATS=jpg,jpeg,png,webp\n")
+
+    settings = Settings(_env_file=env_file, base_dir=tmp_path)
+
+    assert settings.cors_origins == frozenset({"*"})
+    assert settings.allowed_image_formats == frozenset({"jpg", "jpeg", "png", "webp"})
+
+
+def test_list_settings_defaults(monkeypatch, tmp_path):
+    monkeypatch.delenv("CORS_ORIGINS", raising=False)
+    monkeypatch.delenv("ALLOWED_IMAGE_FORMATS", raising=False)
+
+    settings = Settings(_env_file=None, base_dir=tmp_path)
+
+    assert settings.cors_origins == frozenset({"*"})
+    assert settings.allowed_image_formats == frozenset({"jpg", "jpeg", "png", "webp"})
+
+
+def test_warm_up_skips_template_credentials(tmp_path):
+    settings = Settings(
+        _env_file=None, base_dir=tmp_path,
+        instagram_username="your_instagram_username", instagram_password="your_instagram_password",
+        instagram_access_token=None, instagram_account_id=None,
+        facebook_access_token="EAAB-real-token", facebook_page_id="1234567890",
+    )
+
+    assert settings.enabled_platforms == ("instagram", "facebook")
+    assert settings.warm_up_platforms == ("facebook",)
+    assert Settings(
+        _env_file=None, base_dir=tmp_path, warm_up_on_startup=False,
+        facebook_access_token="EAAB-real-token", facebook_page_id="1234567890",
+    ).warm_up_platforms == ()